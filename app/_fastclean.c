@@ -0,0 +1,95 @@
+/* Optional C extension backing clean_text().
+ *
+ * strip_tags(data: bytes) -> bytes removes <...> spans from UTF-8 text,
+ * dropping an unterminated trailing tag, exactly like the pure-Python
+ * scanner in app/main.py. Tag boundaries are found 32 bytes at a time
+ * with AVX2 when available, falling back to memchr otherwise. '<' and
+ * '>' are ASCII, so byte-level cuts never split a UTF-8 sequence.
+ *
+ * Build in place from the project root:
+ *     python setup.py build_ext --inplace
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <string.h>
+
+#if defined(__AVX2__)
+#include <immintrin.h>
+#endif
+
+/* First occurrence of c in [p, end), or end if absent. */
+static const char *
+scan_for(const char *p, const char *end, char c)
+{
+#if defined(__AVX2__)
+    const __m256i needle = _mm256_set1_epi8(c);
+    while (p + 32 <= end) {
+        __m256i chunk = _mm256_loadu_si256((const __m256i *)p);
+        unsigned int mask =
+            (unsigned int)_mm256_movemask_epi8(_mm256_cmpeq_epi8(chunk, needle));
+        if (mask)
+            return p + __builtin_ctz(mask);
+        p += 32;
+    }
+#endif
+    if (p < end) {
+        const char *hit = memchr(p, c, (size_t)(end - p));
+        if (hit)
+            return hit;
+    }
+    return end;
+}
+
+static PyObject *
+strip_tags(PyObject *Py_UNUSED(module), PyObject *arg)
+{
+    char *buf;
+    Py_ssize_t len;
+    if (PyBytes_AsStringAndSize(arg, &buf, &len) < 0)
+        return NULL;
+
+    /* Output can only shrink, so size the buffer for the input. */
+    PyObject *out = PyBytes_FromStringAndSize(NULL, len);
+    if (out == NULL)
+        return NULL;
+    char *dst = PyBytes_AS_STRING(out);
+    char *w = dst;
+
+    const char *p = buf;
+    const char *end = buf + len;
+    while (p < end) {
+        const char *lt = scan_for(p, end, '<');
+        memcpy(w, p, (size_t)(lt - p));
+        w += lt - p;
+        if (lt == end)
+            break;
+        const char *gt = scan_for(lt + 1, end, '>');
+        if (gt == end)  /* unterminated tag: drop the tail */
+            break;
+        p = gt + 1;
+    }
+
+    if (_PyBytes_Resize(&out, (Py_ssize_t)(w - dst)) < 0)
+        return NULL;
+    return out;
+}
+
+static PyMethodDef fastclean_methods[] = {
+    {"strip_tags", strip_tags, METH_O,
+     "strip_tags(data: bytes) -> bytes\n\nRemove <...> spans from UTF-8 bytes."},
+    {NULL, NULL, 0, NULL},
+};
+
+static struct PyModuleDef fastclean_module = {
+    PyModuleDef_HEAD_INIT,
+    "app._fastclean",
+    "SIMD-accelerated HTML tag stripping for review text.",
+    0,
+    fastclean_methods,
+};
+
+PyMODINIT_FUNC
+PyInit__fastclean(void)
+{
+    return PyModule_Create(&fastclean_module);
+}
@@ -1,17 +1,33 @@
 # app/main.py
 from __future__ import annotations
 
+import functools
 import os
-import re
 import html as ihtml
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Literal
 
+from concurrent.futures import ThreadPoolExecutor
+
+import ciso8601
+import orjson
 from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from elasticsearch import Elasticsearch, helpers
 from elasticsearch import NotFoundError, BadRequestError
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from elasticsearch.serializer import JSONSerializer
+
+# Prefer the Rust port of VADER (same algorithm, releases the GIL);
+# fall back to the pure-Python implementation when it isn't installed.
+try:
+    from vader_sentimental import SentimentIntensityAnalyzer
+
+    VADER_RELEASES_GIL = True
+except ImportError:
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+    VADER_RELEASES_GIL = False
 
 
 # -----------------------------
@@ -23,28 +39,96 @@ INDEX_NAME = os.getenv("ES_INDEX", "reviews_v1")
 MAX_PAGE_SIZE = 100
 DEFAULT_PAGE_SIZE = 10
 
-TAG_RE = re.compile(r"<[^>]+>")
+# Bulk tuning: bigger chunks mean fewer HTTP round-trips; re-tune per cluster.
+ES_BULK_CHUNK_SIZE = int(os.getenv("ES_BULK_CHUNK_SIZE", "1000"))
+ES_BULK_MAX_BYTES = int(os.getenv("ES_BULK_MAX_BYTES", str(10 * 1024 * 1024)))
+ES_BULK_TIMEOUT = 300
+
+# Optional C extension for tag stripping (python setup.py build_ext --inplace).
+try:
+    from app._fastclean import strip_tags as _strip_tags_c
+except ImportError:
+    _strip_tags_c = None
+
 sent_analyzer = SentimentIntensityAnalyzer()
 
 
+class ORJSONSerializer(JSONSerializer):
+    """Request/response JSON via orjson (C), a multiple-x serializer speedup
+    on long review bodies compared to the client's stdlib default."""
+
+    def dumps(self, data: Any) -> bytes:
+        # The 8.x+ serializer contract is bytes; the transport compresses
+        # and sends the raw output.
+        if isinstance(data, str):
+            return data.encode("utf-8")
+        return orjson.dumps(data, default=str)
+
+    def loads(self, s: Any) -> Any:
+        return orjson.loads(s)
+
+
+# Shared client: one connection pool for the whole process instead of a new
+# TCP/TLS handshake per request. maxsize should cover expected concurrency.
+ES_POOL_MAXSIZE = int(os.getenv("ES_POOL_MAXSIZE", "64"))
+
+_es: Optional[Elasticsearch] = None
+
+
 def get_es() -> Elasticsearch:
-    return Elasticsearch(ES_URL)
+    global _es
+    if _es is None:
+        _es = Elasticsearch(
+            ES_URL,
+            connections_per_node=ES_POOL_MAXSIZE,
+            request_timeout=30,
+            http_compress=True,
+            serializer=ORJSONSerializer(),
+        )
+    return _es
 
 
 def clean_text(s: str) -> str:
-    s = s or ""
-    s = ihtml.unescape(s)
-    s = TAG_RE.sub(" ", s)
-    return " ".join(s.split()).strip()
+    s = ihtml.unescape(s or "")
+    if _strip_tags_c is not None:
+        return " ".join(_strip_tags_c(s.encode("utf-8")).decode("utf-8").split())
+    # Pure-Python fallback: incremental str.find scan, no backtracking,
+    # and an unterminated "<" just drops the tail.
+    out: List[str] = []
+    i = 0
+    while (lt := s.find("<", i)) != -1:
+        out.append(s[i:lt])
+        gt = s.find(">", lt + 1)
+        if gt == -1:
+            i = len(s)
+            break
+        i = gt + 1
+    out.append(s[i:])
+    return " ".join("".join(out).split())
+
+
+@functools.lru_cache(maxsize=100_000)
+def _sentiment_compound(text: str) -> float:
+    # Review datasets repeat short titles ("Great!", "Bad") constantly;
+    # caching the compound score skips VADER entirely on repeats.
+    return float(sent_analyzer.polarity_scores(text)["compound"])
 
 
 def compute_sentiment(text: str) -> tuple[str, float]:
-    score = sent_analyzer.polarity_scores(text)["compound"]
+    score = _sentiment_compound(text)
     if score >= 0.05:
-        return "positive", float(score)
+        return "positive", score
     if score <= -0.05:
-        return "negative", float(score)
-    return "neutral", float(score)
+        return "negative", score
+    return "neutral", score
+
+
+def compute_sentiments(texts: List[str]) -> List[tuple[str, float]]:
+    # Threads only help with the Rust analyzer, which releases the GIL.
+    if VADER_RELEASES_GIL and len(texts) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as pool:
+            return list(pool.map(compute_sentiment, texts))
+    return [compute_sentiment(t) for t in texts]
 
 
 # -----------------------------
@@ -116,6 +200,42 @@ INDEX_BODY: Dict[str, Any] = {
 }
 
 
+# -----------------------------
+# Ingest pipeline
+# -----------------------------
+# Full VADER cannot run in Painless, so the compound score stays a batched
+# client-side precompute; the label thresholding moves to the cluster so
+# bulk docs only need to carry the score.
+SENTIMENT_PIPELINE = "reviews-sentiment"
+
+SENTIMENT_PIPELINE_BODY: Dict[str, Any] = {
+    "description": "Derive the sentiment label from a precomputed sentiment_score.",
+    "processors": [
+        {
+            "script": {
+                "lang": "painless",
+                "source": (
+                    "if (ctx.sentiment == null && ctx.sentiment_score != null) {"
+                    " double s = ctx.sentiment_score;"
+                    " ctx.sentiment = s >= 0.05 ? 'positive'"
+                    " : (s <= -0.05 ? 'negative' : 'neutral');"
+                    " }"
+                ),
+            }
+        }
+    ],
+}
+
+_pipeline_ready = False
+
+
+def ensure_sentiment_pipeline(es: Elasticsearch) -> None:
+    global _pipeline_ready
+    if not _pipeline_ready:
+        es.ingest.put_pipeline(id=SENTIMENT_PIPELINE, body=SENTIMENT_PIPELINE_BODY)
+        _pipeline_ready = True
+
+
 # -----------------------------
 # FastAPI app
 # -----------------------------
@@ -126,12 +246,23 @@ app = FastAPI(
 )
 
 
+@app.on_event("startup")
+def init_es() -> None:
+    # Build the shared client (and its connection pool) once, up front.
+    get_es()
+
+
 # -----------------------------
 # Helpers for ES queries
 # -----------------------------
 SortType = Literal["relevance", "newest", "oldest", "rating_desc", "rating_asc"]
 
 
+# Shared skeleton for the common "no query, no filters" case; treat as
+# read-only, like every body coming out of build_query_cached.
+_MATCH_ALL_QUERY: Dict[str, Any] = {"bool": {"must": [{"match_all": {}}], "filter": []}}
+
+
 def build_filters(
     product_id: Optional[str],
     sentiment: Optional[str],
@@ -140,31 +271,24 @@ def build_filters(
     date_from: Optional[datetime],
     date_to: Optional[datetime],
 ) -> List[Dict[str, Any]]:
-    filters: List[Dict[str, Any]] = []
-
-    if product_id:
-        filters.append({"term": {"product_id": product_id}})
-
-    if sentiment:
-        filters.append({"term": {"sentiment": sentiment}})
-
-    if min_rating is not None or max_rating is not None:
-        rng: Dict[str, Any] = {}
-        if min_rating is not None:
-            rng["gte"] = min_rating
-        if max_rating is not None:
-            rng["lte"] = max_rating
-        filters.append({"range": {"rating": rng}})
-
-    if date_from is not None or date_to is not None:
-        rng: Dict[str, Any] = {}
-        if date_from is not None:
-            rng["gte"] = date_from.isoformat()
-        if date_to is not None:
-            rng["lte"] = date_to.isoformat()
-        filters.append({"range": {"created_at": rng}})
-
-    return filters
+    rating_rng = {
+        k: v for k, v in (("gte", min_rating), ("lte", max_rating)) if v is not None
+    }
+    date_rng = {
+        k: v.isoformat()
+        for k, v in (("gte", date_from), ("lte", date_to))
+        if v is not None
+    }
+    return [
+        f
+        for f in (
+            {"term": {"product_id": product_id}} if product_id else None,
+            {"term": {"sentiment": sentiment}} if sentiment else None,
+            {"range": {"rating": rating_rng}} if rating_rng else None,
+            {"range": {"created_at": date_rng}} if date_rng else None,
+        )
+        if f
+    ]
 
 
 def build_query(q: Optional[str], filters: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -184,9 +308,28 @@ def build_query(q: Optional[str], filters: List[Dict[str, Any]]) -> Dict[str, An
                 "filter": filters,
             }
         }
+    if not filters:
+        return _MATCH_ALL_QUERY
     return {"bool": {"must": [{"match_all": {}}], "filter": filters}}
 
 
+@functools.lru_cache(maxsize=1024)
+def build_query_cached(
+    q: Optional[str],
+    product_id: Optional[str],
+    sentiment: Optional[str],
+    min_rating: Optional[int],
+    max_rating: Optional[int],
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+) -> Dict[str, Any]:
+    """Memoized build_filters + build_query for the hot search/analytics
+    endpoints. Repeated parameter combinations reuse one shared body, so
+    callers must never mutate the returned dict."""
+    filters = build_filters(product_id, sentiment, min_rating, max_rating, date_from, date_to)
+    return build_query(q, filters)
+
+
 def build_sort(sort: SortType) -> Optional[List[Dict[str, Any]]]:
     if sort == "newest":
         return [{"created_at": {"order": "desc"}}, {"_score": {"order": "desc"}}]
@@ -200,6 +343,15 @@ def build_sort(sort: SortType) -> Optional[List[Dict[str, Any]]]:
     return None
 
 
+def primary_shard_count(es: Elasticsearch, index: str) -> int:
+    try:
+        settings = es.indices.get_settings(index=index)
+        index_settings = settings[next(iter(settings))]["settings"]["index"]
+        return int(index_settings["number_of_shards"])
+    except Exception:
+        return 1
+
+
 def ensure_index_exists(es: Elasticsearch) -> None:
     if not es.indices.exists(index=INDEX_NAME):
         raise HTTPException(
@@ -230,6 +382,7 @@ def health():
 def create_index():
     es = get_es()
     try:
+        ensure_sentiment_pipeline(es)
         if es.indices.exists(index=INDEX_NAME):
             return {"created": False, "index": INDEX_NAME, "message": "already exists"}
         es.indices.create(index=INDEX_NAME, body=INDEX_BODY)
@@ -245,34 +398,80 @@ def bulk_ingest(reviews: List[ReviewIn]):
     es = get_es()
     ensure_index_exists(es)
 
+    # Columnar staging: pull each field out of the models once, run the
+    # cleaning and scoring passes over whole columns, then assemble docs in
+    # a single tight loop over the parallel lists — no per-doc attribute
+    # lookups in the hot generator.
+    ids = [r.review_id for r in reviews]
+    product_ids = [r.product_id for r in reviews]
+    product_names = [r.product_name for r in reviews]
+    ratings = [r.rating for r in reviews]
+    # Raw datetimes: the client's orjson serializer emits RFC-3339 in C.
+    created_ats = [r.created_at for r in reviews]
+    titles = [clean_text(r.review_title or "") for r in reviews]
+    texts = [clean_text(r.review_text or "") for r in reviews]
+    scores = [
+        score
+        for _label, score in compute_sentiments(
+            [f"{title} {text}".strip() for title, text in zip(titles, texts)]
+        )
+    ]
+
     def actions():
-        for r in reviews:
-            title = clean_text(r.review_title or "")
-            text = clean_text(r.review_text or "")
-            label, score = compute_sentiment(f"{title} {text}".strip())
-            doc = {
-                "review_id": r.review_id,
-                "product_id": r.product_id,
-                "product_name": r.product_name,
-                "rating": r.rating,
-                "review_title": title,
-                "review_text": text,
-                "created_at": r.created_at.isoformat(),
-                "sentiment": label,
-                "sentiment_score": score,
+        # The label is derived cluster-side by the sentiment pipeline,
+        # so bulk docs only carry the precomputed score.
+        for rid, pid, pname, rating, created, title, text, score in zip(
+            ids, product_ids, product_names, ratings, created_ats, titles, texts, scores
+        ):
+            yield {
+                "_index": INDEX_NAME,
+                "_id": rid,
+                "_source": {
+                    "review_id": rid,
+                    "product_id": pid,
+                    "product_name": pname,
+                    "rating": rating,
+                    "review_title": title,
+                    "review_text": text,
+                    "created_at": created,
+                    "sentiment_score": score,
+                },
             }
-            yield {"_index": INDEX_NAME, "_id": r.review_id, "_source": doc}
 
     try:
-        helpers.bulk(es, actions(), chunk_size=500, request_timeout=120)
+        ensure_sentiment_pipeline(es)
+        # Pause refreshes while bulk-loading so ES isn't flushing segments
+        # mid-ingest; restore the default and refresh once at the end.
+        es.indices.put_settings(index=INDEX_NAME, body={"index": {"refresh_interval": "-1"}})
+        # One indexing thread per primary shard scales ingest near-linearly;
+        # the shared client's pool (ES_POOL_MAXSIZE) easily covers 8 threads.
+        thread_count = min(8, max(1, primary_shard_count(es, INDEX_NAME)))
+        errors = []
+        try:
+            # Long bulk timeout goes on the client via options(); per-call
+            # request_timeout kwargs are not accepted by the 9.x client.
+            for ok, info in helpers.parallel_bulk(
+                es.options(request_timeout=ES_BULK_TIMEOUT),
+                actions(),
+                thread_count=thread_count,
+                queue_size=4,
+                chunk_size=ES_BULK_CHUNK_SIZE,
+                max_chunk_bytes=ES_BULK_MAX_BYTES,
+                raise_on_error=False,
+                pipeline=SENTIMENT_PIPELINE,
+            ):
+                if not ok:
+                    errors.append(info)
+        finally:
+            es.indices.put_settings(index=INDEX_NAME, body={"index": {"refresh_interval": "1s"}})
         es.indices.refresh(index=INDEX_NAME)
-        return {"ingested": len(reviews), "index": INDEX_NAME}
+        return {"ingested": len(reviews) - len(errors), "errors": errors, "index": INDEX_NAME}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/reviews", response_model=ReviewOut)
-def create_review(review: ReviewIn):
+def create_review(review: ReviewIn, refresh: bool = False):
     es = get_es()
     ensure_index_exists(es)
 
@@ -287,14 +486,24 @@ def create_review(review: ReviewIn):
         "rating": review.rating,
         "review_title": title,
         "review_text": text,
-        "created_at": review.created_at.isoformat(),
+        # Raw datetime: the orjson serializer emits RFC-3339 in C.
+        "created_at": review.created_at,
         "sentiment": label,
         "sentiment_score": score,
     }
 
     try:
-        es.index(index=INDEX_NAME, id=review.review_id, document=doc, refresh=True)
-        return ReviewOut(**{**doc, "created_at": review.created_at})
+        # refresh=wait_for only when the caller needs read-your-writes;
+        # the default leaves visibility to the index refresh interval.
+        es.index(
+            index=INDEX_NAME,
+            id=review.review_id,
+            document=doc,
+            refresh="wait_for" if refresh else False,
+        )
+        # model_construct skips re-validation; these fields were just
+        # validated on the way in.
+        return ReviewOut.model_construct(**doc)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -307,10 +516,12 @@ def get_review(review_id: str):
     try:
         res = es.get(index=INDEX_NAME, id=review_id)
         src = res["_source"]
-        return ReviewOut(
+        # model_construct: no re-validation of data we indexed ourselves
+        return ReviewOut.model_construct(
             **{
                 **src,
-                "created_at": datetime.fromisoformat(src["created_at"].replace("Z", "+00:00")),
+                # ciso8601 parses ISO-8601 (incl. the Z suffix) in C
+                "created_at": ciso8601.parse_datetime(src["created_at"]),
             }
         )
     except NotFoundError:
@@ -320,58 +531,75 @@ def get_review(review_id: str):
 
 
 @app.put("/reviews/{review_id}", response_model=ReviewOut)
-def update_review(review_id: str, patch: ReviewUpdate):
+def update_review(review_id: str, patch: ReviewUpdate, refresh: bool = False):
     es = get_es()
     ensure_index_exists(es)
 
-    try:
-        existing = es.get(index=INDEX_NAME, id=review_id)["_source"]
-    except NotFoundError:
-        raise HTTPException(status_code=404, detail="Review not found")
-
-    updated = dict(existing)
-
-    # Apply patch fields if provided
+    # Build a partial doc with only the patched fields; ES merges it
+    # server-side, so unchanged fields are not re-analyzed.
+    partial: Dict[str, Any] = {}
     if patch.product_id is not None:
-        updated["product_id"] = patch.product_id
+        partial["product_id"] = patch.product_id
     if patch.product_name is not None:
-        updated["product_name"] = patch.product_name
+        partial["product_name"] = patch.product_name
     if patch.rating is not None:
-        updated["rating"] = patch.rating
+        partial["rating"] = patch.rating
     if patch.review_title is not None:
-        updated["review_title"] = clean_text(patch.review_title)
+        partial["review_title"] = clean_text(patch.review_title)
     if patch.review_text is not None:
-        updated["review_text"] = clean_text(patch.review_text)
+        partial["review_text"] = clean_text(patch.review_text)
     if patch.created_at is not None:
-        updated["created_at"] = patch.created_at.isoformat()
-
-    # Recompute sentiment if title/text changed
-    title = updated.get("review_title", "")
-    text = updated.get("review_text", "")
-    label, score = compute_sentiment(f"{title} {text}".strip())
-    updated["sentiment"] = label
-    updated["sentiment_score"] = score
-    updated["review_id"] = review_id
+        partial["created_at"] = patch.created_at  # orjson emits RFC-3339
+
+    # Sentiment depends on both text fields, so fetch the stored doc only
+    # when the patch touches one of them; metadata-only patches skip the GET
+    # and the recompute entirely.
+    if "review_title" in partial or "review_text" in partial:
+        try:
+            existing = es.get(index=INDEX_NAME, id=review_id)["_source"]
+        except NotFoundError:
+            raise HTTPException(status_code=404, detail="Review not found")
+        title = partial.get("review_title", existing.get("review_title", ""))
+        text = partial.get("review_text", existing.get("review_text", ""))
+        if (title, text) != (
+            existing.get("review_title", ""),
+            existing.get("review_text", ""),
+        ) or "sentiment" not in existing:
+            label, score = compute_sentiment(f"{title} {text}".strip())
+            partial["sentiment"] = label
+            partial["sentiment_score"] = score
 
     try:
-        es.index(index=INDEX_NAME, id=review_id, document=updated, refresh=True)
-        return ReviewOut(
+        # _source must live in the body: the client drops the kwarg form
+        # whenever a raw body= dict is passed, and without it the update
+        # response carries no "get" section.
+        res = es.update(
+            index=INDEX_NAME,
+            id=review_id,
+            body={"doc": partial, "doc_as_upsert": False, "_source": True},
+            refresh="wait_for" if refresh else False,
+        )
+        updated = res["get"]["_source"]
+        return ReviewOut.model_construct(
             **{
                 **updated,
-                "created_at": datetime.fromisoformat(updated["created_at"].replace("Z", "+00:00")),
+                "review_id": review_id,
+                "created_at": ciso8601.parse_datetime(updated["created_at"]),
             }
         )
+    except NotFoundError:
+        raise HTTPException(status_code=404, detail="Review not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.delete("/reviews/{review_id}")
-def delete_review(review_id: str):
+def delete_review(review_id: str, refresh: bool = False):
     es = get_es()
     ensure_index_exists(es)
 
     try:
-        es.delete(index=INDEX_NAME, id=review_id, refresh=True)
+        es.delete(index=INDEX_NAME, id=review_id, refresh="wait_for" if refresh else False)
         return {"deleted": True, "review_id": review_id}
     except NotFoundError:
         raise HTTPException(status_code=404, detail="Review not found")
@@ -379,7 +607,7 @@ def delete_review(review_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/search")
+@app.get("/search", response_class=ORJSONResponse)
 def search_reviews(
     q: Optional[str] = None,
     productId: Optional[str] = None,
@@ -391,12 +619,12 @@ def search_reviews(
     sort: SortType = "relevance",
     page: int = Query(default=1, ge=1),
     size: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    trackTotalHits: bool = False,
 ):
     es = get_es()
     ensure_index_exists(es)
 
-    filters = build_filters(productId, sentiment, minRating, maxRating, dateFrom, dateTo)
-    query = build_query(q, filters)
+    query = build_query_cached(q, productId, sentiment, minRating, maxRating, dateFrom, dateTo)
     sort_body = build_sort(sort)
 
     body: Dict[str, Any] = {
@@ -412,22 +640,26 @@ def search_reviews(
     }
     if sort_body:
         body["sort"] = sort_body
+    # Exact totals cost coordinator work; opt in via ?trackTotalHits=true.
+    # Omitting the key keeps ES's default count, capped at 10000.
+    if trackTotalHits:
+        body["track_total_hits"] = True
 
     try:
         res = es.search(index=INDEX_NAME, body=body)
         hits = res["hits"]["hits"]
-        total = res["hits"]["total"]["value"] if isinstance(res["hits"]["total"], dict) else res["hits"]["total"]
+        total = res["hits"].get("total")
+        if isinstance(total, dict):
+            total = total.get("value")
 
+        # Annotate the _source dicts in place; a dict-spread copy per hit
+        # would just churn the allocator.
         items = []
         for h in hits:
             src = h["_source"]
-            items.append(
-                {
-                    **src,
-                    "_score": h.get("_score"),
-                    "highlights": h.get("highlight", {}),
-                }
-            )
+            src["_score"] = h.get("_score")
+            src["highlights"] = h.get("highlight", {})
+            items.append(src)
 
         return {
             "page": page,
@@ -439,7 +671,7 @@ def search_reviews(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/analytics/summary")
+@app.get("/analytics/summary", response_class=ORJSONResponse)
 def analytics_summary(
     q: Optional[str] = None,
     productId: Optional[str] = None,
@@ -447,12 +679,12 @@ def analytics_summary(
     maxRating: Optional[int] = Query(default=None, ge=1, le=5),
     dateFrom: Optional[datetime] = None,
     dateTo: Optional[datetime] = None,
+    trackTotalHits: bool = False,
 ):
     es = get_es()
     ensure_index_exists(es)
 
-    filters = build_filters(productId, None, minRating, maxRating, dateFrom, dateTo)
-    query = build_query(q, filters)
+    query = build_query_cached(q, productId, None, minRating, maxRating, dateFrom, dateTo)
 
     body = {
         "size": 0,
@@ -462,10 +694,16 @@ def analytics_summary(
             "sentiments": {"terms": {"field": "sentiment", "size": 10}},
         },
     }
+    # Omit the key unless opted in: ES then returns its default count
+    # (capped at 10000) instead of no total at all.
+    if trackTotalHits:
+        body["track_total_hits"] = True
 
     try:
         res = es.search(index=INDEX_NAME, body=body)
-        total = res["hits"]["total"]["value"] if isinstance(res["hits"]["total"], dict) else res["hits"]["total"]
+        total = res["hits"].get("total")
+        if isinstance(total, dict):
+            total = total.get("value")
         avg_rating = res["aggregations"]["avg_rating"]["value"]
         buckets = res["aggregations"]["sentiments"]["buckets"]
 
@@ -478,7 +716,7 @@ def analytics_summary(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/analytics/trends")
+@app.get("/analytics/trends", response_class=ORJSONResponse)
 def analytics_trends(
     q: Optional[str] = None,
     productId: Optional[str] = None,
@@ -487,12 +725,12 @@ def analytics_trends(
     maxRating: Optional[int] = Query(default=None, ge=1, le=5),
     dateFrom: Optional[datetime] = None,
     dateTo: Optional[datetime] = None,
+    trackTotalHits: bool = False,
 ):
     es = get_es()
     ensure_index_exists(es)
 
-    filters = build_filters(productId, None, minRating, maxRating, dateFrom, dateTo)
-    query = build_query(q, filters)
+    query = build_query_cached(q, productId, None, minRating, maxRating, dateFrom, dateTo)
 
     body = {
         "size": 0,
@@ -511,6 +749,9 @@ def analytics_trends(
             }
         },
     }
+    # Trends don't report a total, but honor the opt-in for parity.
+    if trackTotalHits:
+        body["track_total_hits"] = True
 
     try:
         res = es.search(index=INDEX_NAME, body=body)
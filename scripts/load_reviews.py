@@ -1,36 +1,115 @@
+import functools
 import json
-import re
+import os
+import sys
 import html as ihtml
 from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Optional C extension for tag stripping (python setup.py build_ext --inplace).
+try:
+    from app._fastclean import strip_tags as _strip_tags_c
+except ImportError:
+    _strip_tags_c = None
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 from elasticsearch import Elasticsearch, helpers
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from elasticsearch.serializer import JSONSerializer
+
+class ORJSONSerializer(JSONSerializer):
+    """Bulk-request JSON via orjson (C) instead of the stdlib default."""
+
+    def dumps(self, data):
+        # 8.x+ serializer contract: return bytes.
+        if isinstance(data, str):
+            return data.encode("utf-8")
+        return orjson.dumps(data, default=str)
+
+    def loads(self, s):
+        return orjson.loads(s)
+
+# Rust port of VADER when available (same scores, releases the GIL).
+try:
+    from vader_sentimental import SentimentIntensityAnalyzer
+    VADER_RELEASES_GIL = True
+except ImportError:
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    VADER_RELEASES_GIL = False
 
 INDEX = "reviews_v1"
 ES_URL = "http://localhost:9200"
 
-TAG_RE = re.compile(r"<[^>]+>")
+BULK_CHUNK_SIZE = int(os.getenv("ES_BULK_CHUNK_SIZE", "1000"))
+BULK_MAX_BYTES = int(os.getenv("ES_BULK_MAX_BYTES", str(10 * 1024 * 1024)))
+
+# Labels are derived cluster-side from the precomputed score; full VADER
+# cannot run in Painless, so scoring stays a client-side batch.
+SENTIMENT_PIPELINE = "reviews-sentiment"
+SENTIMENT_PIPELINE_BODY = {
+    "description": "Derive the sentiment label from a precomputed sentiment_score.",
+    "processors": [
+        {
+            "script": {
+                "lang": "painless",
+                "source": (
+                    "if (ctx.sentiment == null && ctx.sentiment_score != null) {"
+                    " double s = ctx.sentiment_score;"
+                    " ctx.sentiment = s >= 0.05 ? 'positive'"
+                    " : (s <= -0.05 ? 'negative' : 'neutral');"
+                    " }"
+                ),
+            }
+        }
+    ],
+}
+
 analyzer = SentimentIntensityAnalyzer()
 
 def clean_text(s: str) -> str:
-    s = s or ""
-    s = ihtml.unescape(s)
-    s = TAG_RE.sub(" ", s)
-    return " ".join(s.split()).strip()
+    s = ihtml.unescape(s or "")
+    if _strip_tags_c is not None:
+        return " ".join(_strip_tags_c(s.encode("utf-8")).decode("utf-8").split())
+    # Pure-Python fallback: str.find scan, no regex backtracking,
+    # unterminated "<" drops the tail.
+    out, i = [], 0
+    while (lt := s.find("<", i)) != -1:
+        out.append(s[i:lt])
+        gt = s.find(">", lt + 1)
+        if gt == -1:
+            i = len(s)
+            break
+        i = gt + 1
+    out.append(s[i:])
+    return " ".join("".join(out).split())
+
+@functools.lru_cache(maxsize=100_000)
+def _sentiment_compound(text: str) -> float:
+    # Repeated short titles are common in review data; cache their scores.
+    return float(analyzer.polarity_scores(text)["compound"])
 
 def sentiment_label(text: str) -> tuple[str, float]:
-    score = analyzer.polarity_scores(text)["compound"]
+    score = _sentiment_compound(text)
     if score >= 0.05:
-        return "positive", float(score)
+        return "positive", score
     if score <= -0.05:
-        return "negative", float(score)
-    return "neutral", float(score)
+        return "negative", score
+    return "neutral", score
+
+def sentiment_labels(texts: list[str]) -> list[tuple[str, float]]:
+    # Threads only pay off with the Rust analyzer (GIL released per call).
+    if VADER_RELEASES_GIL and len(texts) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as pool:
+            return list(pool.map(sentiment_label, texts))
+    return [sentiment_label(t) for t in texts]
 
 def main():
     project_root = Path(__file__).resolve().parents[1]
     data_path = project_root / "data" / "reviews_sample.json"
 
-    es = Elasticsearch(ES_URL)
+    # Pool must be at least as large as the parallel_bulk thread count.
+    es = Elasticsearch(ES_URL, connections_per_node=16, serializer=ORJSONSerializer())
 
     # Minimal mapping (you can expand this later)
     if not es.indices.exists(index=INDEX):
@@ -55,23 +134,49 @@ def main():
 
     reviews = json.loads(data_path.read_text(encoding="utf-8"))
 
+    es.ingest.put_pipeline(id=SENTIMENT_PIPELINE, body=SENTIMENT_PIPELINE_BODY)
+
+    cleaned = [(clean_text(r.get("review_title", "")), clean_text(r.get("review_text", ""))) for r in reviews]
+    sentiments = sentiment_labels([f"{title} {text}".strip() for title, text in cleaned])
+
     def actions():
-        for r in reviews:
-            title = clean_text(r.get("review_title", ""))
-            text = clean_text(r.get("review_text", ""))
-            label, score = sentiment_label(f"{title} {text}".strip())
+        # The label is filled in by the ingest pipeline from the score.
+        for r, (title, text), (_label, score) in zip(reviews, cleaned, sentiments):
             doc = {
                 **r,
                 "review_title": title,
                 "review_text": text,
-                "sentiment": label,
                 "sentiment_score": score,
             }
             yield {"_index": INDEX, "_id": r["review_id"], "_source": doc}
 
-    helpers.bulk(es, actions(), chunk_size=500, request_timeout=120)
+    # Pause refreshes during the load; one refresh at the end is enough.
+    es.indices.put_settings(index=INDEX, body={"index": {"refresh_interval": "-1"}})
+    # One thread per primary shard so all shards ingest in parallel.
+    settings = es.indices.get_settings(index=INDEX)
+    shards = int(settings[next(iter(settings))]["settings"]["index"]["number_of_shards"])
+    loaded = failed = 0
+    try:
+        # Timeout via options(); the 9.x client rejects per-call kwargs.
+        for ok, info in helpers.parallel_bulk(
+            es.options(request_timeout=300),
+            actions(),
+            thread_count=max(1, shards),
+            queue_size=4,
+            chunk_size=BULK_CHUNK_SIZE,
+            max_chunk_bytes=BULK_MAX_BYTES,
+            raise_on_error=False,
+            pipeline=SENTIMENT_PIPELINE,
+        ):
+            if ok:
+                loaded += 1
+            else:
+                failed += 1
+                print("Failed:", info)
+    finally:
+        es.indices.put_settings(index=INDEX, body={"index": {"refresh_interval": "1s"}})
     es.indices.refresh(index=INDEX)
-    print("Loaded reviews into", INDEX)
+    print(f"Loaded {loaded} reviews into {INDEX} ({failed} failed)")
 
 if __name__ == "__main__":
     main()
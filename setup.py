@@ -0,0 +1,21 @@
+# Builds the optional app._fastclean C extension (SIMD tag stripping).
+# The API and scripts fall back to pure Python when it isn't compiled.
+#
+#     python setup.py build_ext --inplace
+import sys
+
+from setuptools import Extension, setup
+
+extra_compile_args = [] if sys.platform == "win32" else ["-O3", "-march=native"]
+
+setup(
+    name="review-search-fastclean",
+    version="0.1.0",
+    ext_modules=[
+        Extension(
+            "app._fastclean",
+            sources=["app/_fastclean.c"],
+            extra_compile_args=extra_compile_args,
+        )
+    ],
+)